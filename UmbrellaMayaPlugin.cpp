@@ -120,7 +120,8 @@ void onSceneOpened(void* clientData) {
     if (currentScene.length() > 0) {
         MGlobal::displayInfo("Umbrella: Scanning opened scene...");
         
-        ScanResult result = umbrella_scan_file(currentScene.asChar());
+        ScanResult result;
+        umbrella_scan_file(currentScene.asChar(), &result);
         if (result.threats_found > 0) {
             UmbrellaUtils::logThreatDetection(currentScene, result.threats_found);
             MGlobal::displayWarning("Umbrella: Threats detected in opened scene!");
@@ -135,7 +136,8 @@ void onSceneSaved(void* clientData) {
 
     MString currentScene = MFileIO::currentFile();
     if (currentScene.length() > 0) {
-        ScanResult result = umbrella_scan_file(currentScene.asChar());
+        ScanResult result;
+        umbrella_scan_file(currentScene.asChar(), &result);
         if (result.threats_found > 0) {
             UmbrellaUtils::logThreatDetection(currentScene, result.threats_found);
         }
@@ -183,7 +185,8 @@ public:
         }
 
         // Perform scan
-        ScanResult result = umbrella_scan_file(filePath.asChar());
+        ScanResult result;
+        umbrella_scan_file(filePath.asChar(), &result);
 
         // Display results
         MString resultMsg = UmbrellaUtils::formatScanResult(result, filePath);
@@ -231,7 +234,8 @@ public:
         MGlobal::displayInfo(MString("Scanning directory: ") + dirPath + " (this may take a while...)");
 
         // Perform directory scan
-        ScanResult result = umbrella_scan_directory(dirPath.asChar());
+        ScanResult result;
+        umbrella_scan_directory(dirPath.asChar(), &result);
 
         // Display results
         MString resultMsg = UmbrellaUtils::formatScanResult(result, dirPath);
@@ -274,7 +278,8 @@ public:
         MGlobal::displayInfo("Scanning current Maya scene...");
 
         // Perform scan
-        ScanResult result = umbrella_scan_file(currentScene.asChar());
+        ScanResult result;
+        umbrella_scan_file(currentScene.asChar(), &result);
 
         // Display results
         MString resultMsg = UmbrellaUtils::formatScanResult(result, "Current Scene");
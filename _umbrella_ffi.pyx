@@ -0,0 +1,32 @@
+# cython: language_level=3
+"""
+Compiled fast path for the Umbrella scan API.
+Binds the single-path scan functions at compile time instead of going through ctypes.
+"""
+
+cdef extern from "umbrella_maya_plugin.h":
+    ctypedef struct ScanResult:
+        int threats_found
+        int files_scanned
+        int scan_time_ms
+
+    int umbrella_scan_file(const char* file_path, ScanResult* out) nogil
+    int umbrella_scan_directory(const char* dir_path, ScanResult* out) nogil
+
+
+def scan_file(bytes path):
+    """Scan a single file, returning (threats_found, files_scanned, scan_time_ms)"""
+    cdef const char* c_path = path
+    cdef ScanResult result
+    with nogil:
+        umbrella_scan_file(c_path, &result)
+    return result.threats_found, result.files_scanned, result.scan_time_ms
+
+
+def scan_directory(bytes path):
+    """Scan a directory, returning (threats_found, files_scanned, scan_time_ms)"""
+    cdef const char* c_path = path
+    cdef ScanResult result
+    with nogil:
+        umbrella_scan_directory(c_path, &result)
+    return result.threats_found, result.files_scanned, result.scan_time_ms
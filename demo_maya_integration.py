@@ -4,25 +4,129 @@ Umbrella Maya Plugin - 实际集成演示
 这个脚本展示如何在真实的Maya环境中使用Umbrella反病毒插件
 """
 
-import maya.cmds as cmds
-import maya.mel as mel
 import ctypes
+import functools
+import mmap
 import os
+import re
+import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# 定义结构体
-class UmbrellaResult(ctypes.Structure):
-    _fields_ = [
-        ("success", ctypes.c_bool),
-        ("error_code", ctypes.c_int)
-    ]
+from umbrella_ffi import ScanResult, get_instance, load_extension, pack_paths, write_bytes_line
+from umbrella_scenes import SUSPICIOUS_SCRIPT, synthetic_scene_body, write_synthetic_scene
 
-class ScanResult(ctypes.Structure):
-    _fields_ = [
-        ("threats_found", ctypes.c_int),
-        ("files_scanned", ctypes.c_int),
-        ("scan_time_ms", ctypes.c_int)
-    ]
+# 无 Maya 的环境（如 CI 中的无界面测试）下 cmds 为 None
+try:
+    import maya.cmds as cmds
+    import maya.mel as mel
+except ImportError:
+    cmds = None
+    mel = None
+
+# Rust 库不可用时，回退扫描优先使用 Hyperscan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# 优先使用编译的 Cython 扩展，未构建或无法加载时回退到 ctypes
+_umbrella_ffi = load_extension()
+
+# 版本输出行的前缀，预先编码以便直接拼接原始版本 bytes
+VERSION_PREFIX = "📦 Umbrella 版本: ".encode('utf-8')
+
+# 测试场景使用固定路径，重复运行时可直接复用系统页缓存
+TEST_SCENE_PATH = os.path.join(tempfile.gettempdir(), "umbrella_test_scene_with_threats.ma")
+
+# 与 Rust 引擎一致的威胁特征，不区分大小写，按命中的特征种类计数
+THREAT_PATTERNS = [
+    b"import os", b"import subprocess", b"import sys", b"exec(", b"eval(",
+    b"__import__", b"getattr(", b"setattr(",
+    b"system(", b"popen(", b"python(",
+    b"file -delete", b"file -remove", b"deleteUI",
+    b"urllib", b"requests", b"socket", b"http",
+    b"mel.eval", b"cmds.evalDeferred", b"scriptJob",
+]
+
+@functools.lru_cache(maxsize=None)
+def _threat_database():
+    """编译一次 Hyperscan 特征库"""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(pattern) for pattern in THREAT_PATTERNS],
+        ids=list(range(len(THREAT_PATTERNS))),
+        elements=len(THREAT_PATTERNS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(THREAT_PATTERNS)
+    )
+    return db
+
+def _py_scan_bytes(buf):
+    """在 Python 端统计内容中命中的威胁特征种类数"""
+    if hyperscan is not None:
+        matched = set()
+        _threat_database().scan(buf, match_event_handler=lambda id, start, end, flags, ctx: matched.add(id))
+        return len(matched)
+    
+    # 没有 Hyperscan 时做一次小写转换后逐个子串查找，不使用回溯正则
+    lowered = buf.lower()
+    return sum(1 for pattern in THREAT_PATTERNS if pattern.lower() in lowered)
+
+def _fallback_scan_file(path):
+    """不依赖 Rust 库扫描单个文件，返回 (threats_found, files_scanned, scan_time_ms)"""
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            threats_found = _py_scan_bytes(f.read())
+    except OSError:
+        return -1, 0, 0
+    return threats_found, 1, int((time.perf_counter() - start) * 1000)
+
+def _fallback_scan_paths(paths):
+    """不依赖 Rust 库批量扫描文件，无法读取的文件不计入 files_scanned"""
+    start = time.perf_counter()
+    threats_found = files_scanned = 0
+    for path in paths:
+        threats, scanned, _ = _fallback_scan_file(path)
+        if threats >= 0:
+            threats_found += threats
+            files_scanned += scanned
+    return threats_found, files_scanned, int((time.perf_counter() - start) * 1000)
+
+# 超过该大小的场景文件通过内存映射直接交给 Rust 扫描，小文件映射开销不划算
+MMAP_THRESHOLD = 64 * 1024
+
+# 预扫描提交的文件类型，与 Rust 端目录扫描保持一致，避免预扫描缩小覆盖范围
+CANDIDATE_EXTENSIONS = {'.ma', '.mb', '.mel', '.py', '.txt', '.json', '.xml'}
+
+# 预扫描时按目录名跳过的目录（其中不含候选文件）
+SKIP_DIR_NAMES = {'__pycache__', '.git'}
+
+def _iter_candidates(root):
+    """用 os.scandir 递归遍历目录，只产出候选文件路径
+    
+    不进入符号链接指向的目录，但与 Rust 端一致，符号链接指向的文件仍会扫描
+    """
+    pending = [root]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SKIP_DIR_NAMES:
+                        continue
+                    pending.append(entry.path)
+                elif (entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in CANDIDATE_EXTENSIONS):
+                    yield entry.path
+
+def _fallback_scan_directory(root):
+    """不依赖 Rust 库递归扫描目录"""
+    return _fallback_scan_paths(list(_iter_candidates(root)))
 
 class UmbrellaMayaIntegration:
     """Umbrella Maya 插件集成类"""
@@ -30,96 +134,213 @@ class UmbrellaMayaIntegration:
     def __init__(self):
         self.lib = None
         self.initialized = False
+        self._version = None
+        # 单文件扫描结果的输出缓冲区，跨调用复用
+        self._scan_out = ScanResult()
+        self._scan_out_ref = ctypes.byref(self._scan_out)
+        # 缓存路径对应的 C 字符串缓冲区，重复扫描同一路径时无需重新编码
+        self._path_buf_cache = functools.lru_cache(maxsize=256)(self._make_buf)
         
-    def load_library(self):
-        """加载 Umbrella Rust 库"""
-        possible_paths = [
-            "target/release/umbrella_maya_plugin.dll",
-            "umbrella_maya_plugin.dll",
-            "build/lib/umbrella_maya_plugin.dll"
-        ]
-        
-        for dll_path in possible_paths:
-            if os.path.exists(dll_path):
-                try:
-                    self.lib = ctypes.CDLL(dll_path)
-                    
-                    # 定义函数签名
-                    self.lib.umbrella_init.restype = UmbrellaResult
-                    self.lib.umbrella_scan_file.restype = ScanResult
-                    self.lib.umbrella_scan_file.argtypes = [ctypes.c_char_p]
-                    self.lib.umbrella_scan_directory.restype = ScanResult
-                    self.lib.umbrella_scan_directory.argtypes = [ctypes.c_char_p]
-                    self.lib.umbrella_get_version.restype = ctypes.c_char_p
-                    self.lib.umbrella_free_string.restype = None
-                    self.lib.umbrella_free_string.argtypes = [ctypes.c_char_p]
-                    self.lib.umbrella_cleanup.restype = UmbrellaResult
-                    
-                    print(f"✅ 成功加载 Umbrella 库: {dll_path}")
-                    return True
-                    
-                except Exception as e:
-                    print(f"❌ 加载库失败 {dll_path}: {e}")
-                    continue
-        
-        print("❌ 无法找到 Umbrella 库")
-        return False
+    @staticmethod
+    def _make_buf(path):
+        """为路径创建以 NUL 结尾的 C 字符串缓冲区"""
+        return ctypes.create_string_buffer(path.encode('utf-8'))
     
+    def _path_buf(self, path):
+        """获取路径的缓存缓冲区"""
+        return self._path_buf_cache(sys.intern(path))
+        
     def initialize(self):
-        """初始化 Umbrella 引擎"""
-        if not self.lib:
-            if not self.load_library():
-                return False
+        """初始化 Umbrella 引擎（进程内共享同一个库实例，umbrella_init 只执行一次）"""
+        if self.initialized:
+            return True
         
-        result = self.lib.umbrella_init()
-        if result.success:
+        engine = get_instance()
+        if engine is None:
+            # 找不到 Rust 库时进入回退模式，所有扫描改由 Python 端完成
+            self._bind_fallback_functions()
             self.initialized = True
-            print("✅ Umbrella 引擎初始化成功")
+            print("⚠️  未找到 Umbrella 库，使用 Python 回退扫描")
             return True
-        else:
-            print(f"❌ 初始化失败，错误代码: {result.error_code}")
+        if not engine.initialize():
             return False
+        
+        self.lib = engine.lib
+        self._version = engine.version
+        self._bind_scan_functions()
+        self.initialized = True
+        print("✅ Umbrella 引擎初始化成功")
+        return True
     
     def get_version(self):
-        """获取版本信息"""
+        """获取版本信息，返回 UTF-8 编码的 bytes（初始化时已缓存，无需再次调用库）"""
         if not self.initialized:
             return None
-            
-        version_ptr = self.lib.umbrella_get_version()
-        if version_ptr:
-            version = ctypes.string_at(version_ptr).decode('utf-8')
-            self.lib.umbrella_free_string(version_ptr)
-            return version
-        return None
+        return self._version
     
     def scan_current_scene(self):
-        """扫描当前 Maya 场景"""
+        """扫描当前 Maya 场景，Rust 库不可用时使用 Python 端的回退扫描"""
         if not self.initialized:
             print("❌ Umbrella 引擎未初始化")
             return None
         
+        if cmds is None:
+            print("ℹ️  无 Maya 环境，跳过当前场景扫描")
+            return None
+        
         current_scene = cmds.file(query=True, sceneName=True)
         if not current_scene:
             print("ℹ️  当前没有打开的场景文件")
             return None
         
         print(f"🔍 扫描场景文件: {current_scene}")
-        scene_bytes = current_scene.encode('utf-8')
-        result = self.lib.umbrella_scan_file(scene_bytes)
+        if self.lib is not None and self._file_size(current_scene) > MMAP_THRESHOLD:
+            threats_found, files_scanned, scan_time_ms = self._scan_mapped_file(current_scene)
+        else:
+            threats_found, files_scanned, scan_time_ms = self._scan_file(current_scene)
         
         return {
             'file_path': current_scene,
-            'threats_found': result.threats_found,
-            'files_scanned': result.files_scanned,
-            'scan_time_ms': result.scan_time_ms
+            'threats_found': threats_found,
+            'files_scanned': files_scanned,
+            'scan_time_ms': scan_time_ms
+        }
+    
+    def _bind_fallback_functions(self):
+        """回退模式下将单文件、批量与目录扫描都绑定到 Python 端实现"""
+        self._scan_file = _fallback_scan_file
+        self._scan_directory = _fallback_scan_directory
+        self._batched_scan = _fallback_scan_paths
+    
+    def _bind_scan_functions(self):
+        """初始化时一次性选定单路径扫描的调用方式，热路径上不再判断
+        
+        已构建 _umbrella_ffi 扩展时直接调用编译绑定，否则使用 ctypes
+        """
+        if _umbrella_ffi is not None:
+            self._scan_file = self._scan_file_compiled
+            self._scan_directory = self._scan_directory_compiled
+        else:
+            self._c_scan_file = self.lib.umbrella_scan_file
+            self._c_scan_directory = self.lib.umbrella_scan_directory
+            self._scan_file = self._scan_file_ctypes
+            self._scan_directory = self._scan_directory_ctypes
+    
+    @staticmethod
+    def _scan_file_compiled(path):
+        """通过编译扩展扫描单个文件"""
+        return _umbrella_ffi.scan_file(path.encode('utf-8'))
+    
+    @staticmethod
+    def _scan_directory_compiled(path):
+        """通过编译扩展扫描目录"""
+        return _umbrella_ffi.scan_directory(path.encode('utf-8'))
+    
+    def _scan_file_ctypes(self, path):
+        """通过 ctypes 扫描单个文件，返回 (threats_found, files_scanned, scan_time_ms)"""
+        out = self._scan_out
+        self._c_scan_file(self._path_buf(path), self._scan_out_ref)
+        return out.threats_found, out.files_scanned, out.scan_time_ms
+    
+    def _scan_directory_ctypes(self, path):
+        """通过 ctypes 扫描目录，返回 (threats_found, files_scanned, scan_time_ms)"""
+        out = self._scan_out
+        self._c_scan_directory(self._path_buf(path), self._scan_out_ref)
+        return out.threats_found, out.files_scanned, out.scan_time_ms
+    
+    @staticmethod
+    def _file_size(path):
+        """获取文件大小，文件不可访问时返回 0（交由常规扫描报告错误）"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    
+    def _scan_mapped_file(self, path):
+        """内存映射文件后把地址直接交给 umbrella_scan_bytes，避免读入 Python 缓冲区
+        
+        文件无法打开或映射时（如无权限、已删除、检查大小后被截断为空）改走常规扫描，
+        与小文件一样以 threats_found == -1 报告错误
+        """
+        try:
+            with open(path, 'rb') as f:
+                # ACCESS_COPY 映射可写（写时复制），ctypes 才能取得其地址；只读不会触发复制
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as mm:
+                    view = ctypes.c_char.from_buffer(mm)
+                    try:
+                        self.lib.umbrella_scan_bytes(ctypes.addressof(view), len(mm), self._scan_out_ref)
+                    finally:
+                        # 关闭映射前必须释放对其缓冲区的引用
+                        del view
+        except (OSError, ValueError):
+            return self._scan_file(path)
+        out = self._scan_out
+        return out.threats_found, out.files_scanned, out.scan_time_ms
+    
+    def _batched_scan(self, paths):
+        """一次 FFI 调用扫描多个文件
+        
+        所有路径一次编码进同一块以 NUL 分隔的缓冲区，指针数组直接指向其中的偏移，
+        避免为每个路径单独创建 bytes 和 ctypes 对象
+        """
+        # arena 持有路径数据，调用结束前必须保持引用
+        arena, path_array = pack_paths(paths)
+        
+        # 分片在线程池中并发执行，每次调用使用自己的结果缓冲区
+        out = ScanResult()
+        self.lib.umbrella_scan_paths(path_array, len(paths), ctypes.byref(out))
+        return out.threats_found, out.files_scanned, out.scan_time_ms
+    
+    def _parallel_scan(self, paths):
+        """将文件列表分片后在线程池中并行批量扫描（ctypes 调用期间会释放 GIL）"""
+        if not paths:
+            return 0, 0, 0
+        
+        workers = min(os.cpu_count() or 1, len(paths))
+        chunks = [paths[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._batched_scan, chunks))
+        
+        # 各分片并行执行，总耗时取最慢的分片
+        return (
+            sum(r[0] for r in results),
+            sum(r[1] for r in results),
+            max(r[2] for r in results)
+        )
+    
+    def scan_files(self, file_paths):
+        """批量扫描多个文件"""
+        if not self.initialized:
+            print("❌ Umbrella 引擎未初始化")
+            return None
+        
+        threats_found, files_scanned, scan_time_ms = self._batched_scan(file_paths)
+        
+        # 无法读取的文件不会计入 files_scanned，差值即为扫描失败的文件数，由调用方决定如何报告
+        files_failed = len(file_paths) - files_scanned
+        
+        return {
+            'file_paths': list(file_paths),
+            'threats_found': threats_found,
+            'files_scanned': files_scanned,
+            'files_failed': files_failed,
+            'scan_time_ms': scan_time_ms
         }
     
-    def scan_maya_scripts_directory(self):
-        """扫描 Maya 脚本目录"""
+    def scan_maya_scripts_directory(self, prewalk=True):
+        """扫描 Maya 脚本目录
+        
+        prewalk 为 True 时在 Python 端预先筛选候选文件，再分片并行批量扫描；
+        为 False 时交给 Rust 端遍历整个目录
+        """
         if not self.initialized:
             print("❌ Umbrella 引擎未初始化")
             return None
         
+        if cmds is None:
+            print("ℹ️  无 Maya 环境，跳过脚本目录扫描")
+            return None
+        
         maya_app_dir = cmds.internalVar(userAppDir=True)
         scripts_dir = os.path.join(maya_app_dir, "scripts")
         
@@ -128,18 +349,28 @@ class UmbrellaMayaIntegration:
             return None
         
         print(f"🔍 扫描脚本目录: {scripts_dir}")
-        dir_bytes = scripts_dir.encode('utf-8')
-        result = self.lib.umbrella_scan_directory(dir_bytes)
+        if prewalk:
+            threats_found, files_scanned, scan_time_ms = self._parallel_scan(
+                list(_iter_candidates(scripts_dir))
+            )
+        else:
+            threats_found, files_scanned, scan_time_ms = self._scan_directory(scripts_dir)
         
         return {
             'directory_path': scripts_dir,
-            'threats_found': result.threats_found,
-            'files_scanned': result.files_scanned,
-            'scan_time_ms': result.scan_time_ms
+            'threats_found': threats_found,
+            'files_scanned': files_scanned,
+            'scan_time_ms': scan_time_ms
         }
     
     def create_test_scene_with_threats(self):
         """创建一个包含威胁的测试场景"""
+        if cmds is None:
+            # 无 Maya 环境：直接生成等价的 Maya ASCII 场景
+            write_synthetic_scene(TEST_SCENE_PATH, synthetic_scene_body())
+            print(f"📝 创建测试场景: {TEST_SCENE_PATH}")
+            return TEST_SCENE_PATH
+        
         # 创建新场景
         cmds.file(new=True, force=True)
         
@@ -148,46 +379,57 @@ class UmbrellaMayaIntegration:
         sphere = cmds.polySphere(name="test_sphere")[0]
         cmds.move(3, 0, 0, sphere)
         
-        # 创建一个包含可疑代码的脚本节点
-        suspicious_script = '''
-import os
-import subprocess
-# 这是一个可疑的脚本
-exec("print('potentially malicious code')")
-eval("os.system('echo test')")
-mel.eval("system(\\"dir\\");")
-'''
-        
-        # 添加脚本节点
+        # 添加包含可疑代码的脚本节点
         script_node = cmds.scriptNode(
             name="suspicious_script_node",
             scriptType=2,  # Python
-            beforeScript=suspicious_script
+            beforeScript=SUSPICIOUS_SCRIPT
         )
         
         # 保存场景
-        test_scene_path = os.path.join(tempfile.gettempdir(), "umbrella_test_scene_with_threats.ma")
-        cmds.file(rename=test_scene_path)
+        cmds.file(rename=TEST_SCENE_PATH)
         cmds.file(save=True, type="mayaAscii")
         
-        print(f"📝 创建测试场景: {test_scene_path}")
-        return test_scene_path
+        print(f"📝 创建测试场景: {TEST_SCENE_PATH}")
+        return TEST_SCENE_PATH
     
     def cleanup(self):
-        """清理资源"""
-        if self.lib and self.initialized:
-            result = self.lib.umbrella_cleanup()
-            if result.success:
-                print("✅ Umbrella 引擎清理完成")
-            else:
-                print(f"⚠️  清理警告，错误代码: {result.error_code}")
-            self.initialized = False
+        """释放本实例；共享的引擎在进程退出时统一清理"""
+        self.initialized = False
+
+def _configure_stdout():
+    """关闭行缓冲，让零散的小写入先合并在 stdio 缓冲区中（Maya 的输出流不支持时跳过）
+    
+    返回原来的缓冲设置，供 _restore_stdout 恢复；未修改时返回 None
+    """
+    if not hasattr(sys.stdout, 'reconfigure'):
+        return None
+    previous = (sys.stdout.line_buffering, sys.stdout.write_through)
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    return previous
+
+def _restore_stdout(previous):
+    """恢复 _configure_stdout 修改前的缓冲设置"""
+    if previous is not None:
+        line_buffering, write_through = previous
+        sys.stdout.reconfigure(line_buffering=line_buffering, write_through=write_through)
+
+def _emit(lines):
+    """一次性写出一组输出行"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _section_header(title):
+    """演示小节标题"""
+    return ["", "=" * 40, title, "=" * 40]
 
 def demo_umbrella_integration():
     """演示 Umbrella Maya 集成"""
-    print("=" * 60)
-    print("🛡️  Umbrella Maya Plugin - 集成演示")
-    print("=" * 60)
+    previous_stdout = _configure_stdout()
+    _emit([
+        "=" * 60,
+        "🛡️  Umbrella Maya Plugin - 集成演示",
+        "=" * 60,
+    ])
     
     # 创建集成实例
     umbrella = UmbrellaMayaIntegration()
@@ -200,75 +442,74 @@ def demo_umbrella_integration():
         # 显示版本信息
         version = umbrella.get_version()
         if version:
-            print(f"📦 Umbrella 版本: {version}")
+            write_bytes_line(VERSION_PREFIX, version)
         
         # 演示1: 扫描当前场景
-        print("\n" + "="*40)
-        print("演示 1: 扫描当前场景")
-        print("="*40)
+        _emit(_section_header("演示 1: 扫描当前场景"))
         
         scene_result = umbrella.scan_current_scene()
         if scene_result:
-            print(f"📊 扫描结果:")
-            print(f"   文件: {scene_result['file_path']}")
-            print(f"   威胁数量: {scene_result['threats_found']}")
-            print(f"   扫描文件数: {scene_result['files_scanned']}")
-            print(f"   扫描时间: {scene_result['scan_time_ms']}ms")
-            
+            lines = [
+                "📊 扫描结果:",
+                f"   文件: {scene_result['file_path']}",
+                f"   威胁数量: {scene_result['threats_found']}",
+                f"   扫描文件数: {scene_result['files_scanned']}",
+                f"   扫描时间: {scene_result['scan_time_ms']}ms",
+            ]
             if scene_result['threats_found'] > 0:
-                print("⚠️  检测到威胁！请检查场景文件")
+                lines.append("⚠️  检测到威胁！请检查场景文件")
             else:
-                print("✅ 当前场景安全")
+                lines.append("✅ 当前场景安全")
+            _emit(lines)
         
         # 演示2: 创建并扫描包含威胁的场景
-        print("\n" + "="*40)
-        print("演示 2: 扫描包含威胁的测试场景")
-        print("="*40)
+        _emit(_section_header("演示 2: 扫描包含威胁的测试场景"))
         
         threat_scene_path = umbrella.create_test_scene_with_threats()
         
         # 扫描威胁场景
-        threat_scene_bytes = threat_scene_path.encode('utf-8')
-        threat_result = umbrella.lib.umbrella_scan_file(threat_scene_bytes)
+        threat_result = umbrella.scan_files([threat_scene_path])
         
-        print(f"📊 威胁场景扫描结果:")
-        print(f"   文件: {threat_scene_path}")
-        print(f"   威胁数量: {threat_result.threats_found}")
-        print(f"   扫描文件数: {threat_result.files_scanned}")
-        print(f"   扫描时间: {threat_result.scan_time_ms}ms")
-        
-        if threat_result.threats_found > 0:
-            print("⚠️  成功检测到威胁！")
+        lines = [
+            "📊 威胁场景扫描结果:",
+            f"   文件: {threat_scene_path}",
+            f"   威胁数量: {threat_result['threats_found']}",
+            f"   扫描文件数: {threat_result['files_scanned']}",
+            f"   扫描时间: {threat_result['scan_time_ms']}ms",
+        ]
+        if threat_result['files_failed']:
+            lines.append(f"❌ 扫描失败: {threat_result['files_failed']} 个文件无法读取")
+        elif threat_result['threats_found'] > 0:
+            lines.append("⚠️  成功检测到威胁！")
         else:
-            print("❌ 未能检测到威胁")
+            lines.append("❌ 未能检测到威胁")
+        _emit(lines)
         
         # 演示3: 扫描脚本目录
-        print("\n" + "="*40)
-        print("演示 3: 扫描 Maya 脚本目录")
-        print("="*40)
+        _emit(_section_header("演示 3: 扫描 Maya 脚本目录"))
         
         scripts_result = umbrella.scan_maya_scripts_directory()
         if scripts_result:
-            print(f"📊 脚本目录扫描结果:")
-            print(f"   目录: {scripts_result['directory_path']}")
-            print(f"   威胁数量: {scripts_result['threats_found']}")
-            print(f"   扫描文件数: {scripts_result['files_scanned']}")
-            print(f"   扫描时间: {scripts_result['scan_time_ms']}ms")
-            
+            lines = [
+                "📊 脚本目录扫描结果:",
+                f"   目录: {scripts_result['directory_path']}",
+                f"   威胁数量: {scripts_result['threats_found']}",
+                f"   扫描文件数: {scripts_result['files_scanned']}",
+                f"   扫描时间: {scripts_result['scan_time_ms']}ms",
+            ]
             if scripts_result['threats_found'] > 0:
-                print("⚠️  脚本目录中检测到威胁！")
+                lines.append("⚠️  脚本目录中检测到威胁！")
             else:
-                print("✅ 脚本目录安全")
+                lines.append("✅ 脚本目录安全")
+            _emit(lines)
         
-        print("\n" + "="*60)
-        print("🎉 Umbrella Maya Plugin 集成演示完成！")
-        print("🛡️  插件正常工作，可以保护您的 Maya 环境")
-        print("="*60)
-        
-        # 清理临时文件
-        if os.path.exists(threat_scene_path):
-            os.unlink(threat_scene_path)
-            print(f"🗑️  清理临时文件: {threat_scene_path}")
+        _emit([
+            "",
+            "=" * 60,
+            "🎉 Umbrella Maya Plugin 集成演示完成！",
+            "🛡️  插件正常工作，可以保护您的 Maya 环境",
+            "=" * 60,
+        ])
         
     except Exception as e:
         print(f"❌ 演示过程中发生错误: {e}")
@@ -276,13 +517,13 @@ def demo_umbrella_integration():
     finally:
         # 清理资源
         umbrella.cleanup()
+        sys.stdout.flush()
+        _restore_stdout(previous_stdout)
 
 if __name__ == "__main__":
-    # 检查是否在 Maya 环境中运行
-    try:
-        maya_version = cmds.about(version=True)
-        print(f"🎬 检测到 Maya 版本: {maya_version}")
-        demo_umbrella_integration()
-    except:
-        print("❌ 此脚本需要在 Maya Python 环境中运行")
-        print("💡 请在 Maya 中执行: python(\"exec(open('demo_maya_integration.py').read())\")")
+    # 无 Maya 环境时以无界面模式运行，只演示不依赖 Maya 的部分
+    if cmds is None:
+        print("ℹ️  未检测到 Maya，以无界面模式运行（跳过场景与脚本目录扫描）")
+    else:
+        print(f"🎬 检测到 Maya 版本: {cmds.about(version=True)}")
+    demo_umbrella_integration()
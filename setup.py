@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Build the optional Cython extension for the Umbrella scan API.
+Run `cargo build --release` first so the header and library exist, then:
+    python setup.py build_ext --inplace
+"""
+
+import os
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# Rust cdylib builds ship an import library named umbrella_maya_plugin.dll.lib on Windows
+library_name = "umbrella_maya_plugin.dll" if sys.platform == "win32" else "umbrella_maya_plugin"
+library_dir = os.path.abspath("target/release")
+
+# Embed an rpath so the extension finds the Rust library at import time;
+# distutils turns runtime_library_dirs into -L on macOS, so pass it to the linker there
+link_options = {}
+if sys.platform == "darwin":
+    link_options["extra_link_args"] = [f"-Wl,-rpath,{library_dir}"]
+elif sys.platform != "win32":
+    link_options["runtime_library_dirs"] = [library_dir]
+
+extensions = [
+    Extension(
+        "_umbrella_ffi",
+        ["_umbrella_ffi.pyx"],
+        include_dirs=["build/include"],
+        library_dirs=[library_dir],
+        libraries=[library_name],
+        **link_options,
+    )
+]
+
+setup(
+    name="umbrella_maya_plugin_ffi",
+    ext_modules=cythonize(extensions, language_level=3),
+)
@@ -23,11 +23,17 @@ pub extern "C" fn umbrella_init() -> UmbrellaResult {
 /// 
 /// # Arguments
 /// * `file_path` - C string containing the path to scan
+/// * `out` - Receives the scan statistics
 /// 
 /// # Returns
-/// * ScanResult containing scan statistics
+/// * 0 on success, -1 on error (`out` still receives the error result when non-null)
 #[no_mangle]
-pub extern "C" fn umbrella_scan_file(file_path: *const c_char) -> ScanResult {
+pub extern "C" fn umbrella_scan_file(file_path: *const c_char, out: *mut ScanResult) -> c_int {
+    write_scan_result(scan_file(file_path), out)
+}
+
+/// Scan a single file and build its ScanResult
+fn scan_file(file_path: *const c_char) -> ScanResult {
     if file_path.is_null() {
         return ScanResult {
             threats_found: -1,
@@ -59,15 +65,121 @@ pub extern "C" fn umbrella_scan_file(file_path: *const c_char) -> ScanResult {
     }
 }
 
+/// Scan an in-memory buffer for threats
+///
+/// # Arguments
+/// * `data` - Pointer to the file contents to scan
+/// * `len` - Number of bytes available at `data`
+/// * `out` - Receives the scan statistics
+///
+/// # Returns
+/// * 0 on success, -1 on error (`out` still receives the error result when non-null)
+#[no_mangle]
+pub extern "C" fn umbrella_scan_bytes(data: *const u8, len: usize, out: *mut ScanResult) -> c_int {
+    write_scan_result(scan_bytes(data, len), out)
+}
+
+/// Scan an in-memory buffer and build its ScanResult
+fn scan_bytes(data: *const u8, len: usize) -> ScanResult {
+    if data.is_null() {
+        return ScanResult {
+            threats_found: -1,
+            files_scanned: 0,
+            scan_time_ms: 0,
+        };
+    }
+
+    let bytes = unsafe { std::slice::from_raw_parts(data, len) };
+
+    let start_time = std::time::Instant::now();
+    let threats_found = detect_threats_in_content(&String::from_utf8_lossy(bytes));
+    let scan_time = start_time.elapsed().as_millis() as c_int;
+
+    ScanResult {
+        threats_found,
+        files_scanned: 1,
+        scan_time_ms: scan_time,
+    }
+}
+
+/// Scan a batch of files in a single call
+///
+/// # Arguments
+/// * `paths` - Array of C strings containing the file paths to scan
+/// * `count` - Number of entries in `paths`
+/// * `out` - Receives the scan statistics
+///
+/// # Returns
+/// * 0 when every path was scanned, -1 on error or when any path could not be
+///   scanned (`out` still receives the totals for the readable files, so
+///   `count - files_scanned` is the number of failed paths)
+#[no_mangle]
+pub extern "C" fn umbrella_scan_paths(paths: *const *const c_char, count: usize, out: *mut ScanResult) -> c_int {
+    let result = scan_paths(paths, count);
+    let incomplete = (result.files_scanned as usize) < count;
+
+    match write_scan_result(result, out) {
+        0 if incomplete => -1,
+        status => status,
+    }
+}
+
+/// Scan a batch of files and build its ScanResult
+fn scan_paths(paths: *const *const c_char, count: usize) -> ScanResult {
+    if paths.is_null() {
+        return ScanResult {
+            threats_found: -1,
+            files_scanned: 0,
+            scan_time_ms: 0,
+        };
+    }
+
+    let path_ptrs = unsafe { std::slice::from_raw_parts(paths, count) };
+
+    let start_time = std::time::Instant::now();
+    let mut total_threats = 0;
+    let mut files_scanned = 0;
+
+    for &path_ptr in path_ptrs {
+        if path_ptr.is_null() {
+            continue;
+        }
+
+        let path_str = match unsafe { CStr::from_ptr(path_ptr) }.to_str() {
+            Ok(s) => s,
+            Err(_) => continue,
+        };
+
+        let threats = detect_threats_in_file(path_str);
+        if threats >= 0 {
+            total_threats += threats;
+            files_scanned += 1;
+        }
+    }
+    let scan_time = start_time.elapsed().as_millis() as c_int;
+
+    ScanResult {
+        threats_found: total_threats,
+        files_scanned,
+        scan_time_ms: scan_time,
+    }
+}
+
 /// Scan a directory recursively
 /// 
 /// # Arguments
 /// * `dir_path` - C string containing the directory path to scan
+/// * `out` - Receives the scan statistics
 /// 
 /// # Returns
-/// * ScanResult containing scan statistics
+/// * 0 on success, -1 on error (`out` still receives the error result when non-null)
 #[no_mangle]
-pub extern "C" fn umbrella_scan_directory(dir_path: *const c_char) -> ScanResult {
+pub extern "C" fn umbrella_scan_directory(dir_path: *const c_char, out: *mut ScanResult) -> c_int {
+    write_scan_result(scan_directory(dir_path), out)
+}
+
+/// Scan a directory and build its ScanResult
+fn scan_directory(dir_path: *const c_char) -> ScanResult {
     if dir_path.is_null() {
         return ScanResult {
             threats_found: -1,
@@ -133,6 +245,20 @@ pub extern "C" fn umbrella_cleanup() -> UmbrellaResult {
     UmbrellaResult::success()
 }
 
+/// Copy a scan result into the caller-provided out-parameter
+/// Returns 0 on success, -1 if the scan failed or `out` is null
+fn write_scan_result(result: ScanResult, out: *mut ScanResult) -> c_int {
+    if out.is_null() {
+        return -1;
+    }
+
+    unsafe {
+        *out = result;
+    }
+
+    if result.threats_found < 0 { -1 } else { 0 }
+}
+
 /// Detect threats in a single file
 /// Returns the number of threats found (0 = clean, >0 = threats found, -1 = error)
 fn detect_threats_in_file(file_path: &str) -> c_int {
@@ -153,6 +279,12 @@ fn detect_threats_in_file(file_path: &str) -> c_int {
         }
     };
 
+    detect_threats_in_content(&content)
+}
+
+/// Detect threats in already loaded file content
+/// Returns the number of distinct threat patterns found
+fn detect_threats_in_content(content: &str) -> c_int {
     // Simple threat detection patterns for Maya scenes
     let threat_patterns = [
         // Suspicious Python code patterns
@@ -241,3 +373,76 @@ fn scan_directory_for_threats(dir_path: &str) -> (c_int, c_int) {
 
     (total_threats, files_scanned)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn empty_result() -> ScanResult {
+        ScanResult {
+            threats_found: 0,
+            files_scanned: 0,
+            scan_time_ms: 0,
+        }
+    }
+
+    #[test]
+    fn test_scan_paths_null() {
+        let mut result = empty_result();
+        assert_eq!(umbrella_scan_paths(ptr::null(), 0, &mut result), -1);
+        assert_eq!(result.threats_found, -1);
+        assert_eq!(result.files_scanned, 0);
+    }
+
+    #[test]
+    fn test_scan_paths_aggregates_files() {
+        let dir = std::env::temp_dir().join("umbrella_scan_paths_test");
+        std::fs::create_dir_all(&dir).unwrap();
+        let clean = dir.join("clean.ma");
+        let suspicious = dir.join("suspicious.py");
+        std::fs::write(&clean, "createNode transform -n \"pCube1\";").unwrap();
+        std::fs::write(&suspicious, "exec(\"print('x')\")\neval(\"1\")").unwrap();
+
+        let c_paths: Vec<CString> = [&clean, &suspicious, &dir.join("missing.ma")]
+            .iter()
+            .map(|p| CString::new(p.to_str().unwrap()).unwrap())
+            .collect();
+        let ptrs: Vec<*const c_char> = c_paths.iter().map(|p| p.as_ptr()).collect();
+
+        let mut result = empty_result();
+        assert_eq!(umbrella_scan_paths(ptrs.as_ptr(), 2, &mut result), 0);
+        assert_eq!(result.files_scanned, 2);
+        assert_eq!(result.threats_found, 2);
+
+        // The missing file is reported, while the readable files are still counted
+        let mut result = empty_result();
+        assert_eq!(umbrella_scan_paths(ptrs.as_ptr(), ptrs.len(), &mut result), -1);
+        assert_eq!(result.files_scanned, 2);
+        assert_eq!(result.threats_found, 2);
+
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+
+    #[test]
+    fn test_scan_bytes() {
+        let mut result = empty_result();
+
+        let clean = b"createNode transform -n \"pCube1\";";
+        assert_eq!(umbrella_scan_bytes(clean.as_ptr(), clean.len(), &mut result), 0);
+        assert_eq!(result.threats_found, 0);
+        assert_eq!(result.files_scanned, 1);
+
+        let suspicious = b"import os\nexec(\"print('x')\")";
+        assert_eq!(umbrella_scan_bytes(suspicious.as_ptr(), suspicious.len(), &mut result), 0);
+        assert_eq!(result.threats_found, 2);
+
+        assert_eq!(umbrella_scan_bytes(ptr::null(), 0, &mut result), -1);
+        assert_eq!(result.threats_found, -1);
+    }
+
+    #[test]
+    fn test_scan_file_null_out() {
+        let path = CString::new("non_existent_file.ma").unwrap();
+        assert_eq!(umbrella_scan_file(path.as_ptr(), ptr::null_mut()), -1);
+    }
+}
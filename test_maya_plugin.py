@@ -11,62 +11,7 @@ import os
 import sys
 from pathlib import Path
 
-# Define the structures that match the Rust definitions
-class UmbrellaResult(ctypes.Structure):
-    _fields_ = [
-        ("success", ctypes.c_bool),
-        ("error_code", ctypes.c_int)
-    ]
-
-class ScanResult(ctypes.Structure):
-    _fields_ = [
-        ("threats_found", ctypes.c_int),
-        ("files_scanned", ctypes.c_int),
-        ("scan_time_ms", ctypes.c_int)
-    ]
-
-def load_umbrella_library():
-    """Load the Umbrella Rust library"""
-    # Try different possible locations
-    possible_paths = [
-        "target/release/umbrella_maya_plugin.dll",
-        "umbrella_maya_plugin.dll",
-        "build/lib/umbrella_maya_plugin.dll"
-    ]
-    
-    for dll_path in possible_paths:
-        if os.path.exists(dll_path):
-            try:
-                lib = ctypes.CDLL(dll_path)
-                
-                # Define function signatures
-                lib.umbrella_init.restype = UmbrellaResult
-                lib.umbrella_init.argtypes = []
-                
-                lib.umbrella_scan_file.restype = ScanResult
-                lib.umbrella_scan_file.argtypes = [ctypes.c_char_p]
-                
-                lib.umbrella_scan_directory.restype = ScanResult
-                lib.umbrella_scan_directory.argtypes = [ctypes.c_char_p]
-                
-                lib.umbrella_get_version.restype = ctypes.c_char_p
-                lib.umbrella_get_version.argtypes = []
-                
-                lib.umbrella_free_string.restype = None
-                lib.umbrella_free_string.argtypes = [ctypes.c_char_p]
-                
-                lib.umbrella_cleanup.restype = UmbrellaResult
-                lib.umbrella_cleanup.argtypes = []
-                
-                print(f"✅ Successfully loaded Umbrella library from: {dll_path}")
-                return lib
-                
-            except Exception as e:
-                print(f"❌ Failed to load library from {dll_path}: {e}")
-                continue
-    
-    print("❌ Could not find Umbrella library in any expected location")
-    return None
+from umbrella_ffi import ScanResult, get_instance, write_bytes_line
 
 def test_umbrella_in_maya():
     """Test Umbrella functionality within Maya"""
@@ -74,27 +19,23 @@ def test_umbrella_in_maya():
     print("🎬 Testing Umbrella Maya Plugin Integration")
     print("=" * 60)
     
-    # Load the library
-    lib = load_umbrella_library()
-    if not lib:
-        return False
+    # A single result buffer reused by every scan below
+    scan_out = ScanResult()
+    scan_out_ref = ctypes.byref(scan_out)
     
     try:
-        # Test 1: Initialize
+        # Test 1: Initialize (shared with the other entry points in this process)
         print("\n1. Initializing Umbrella engine...")
-        init_result = lib.umbrella_init()
-        if not init_result.success:
-            print(f"❌ Initialization failed with error code: {init_result.error_code}")
+        umb = get_instance()
+        if umb is None or not umb.initialize():
             return False
+        lib = umb.lib
         print("✅ Umbrella engine initialized successfully!")
         
         # Test 2: Get version
         print("\n2. Getting version information...")
-        version_ptr = lib.umbrella_get_version()
-        if version_ptr:
-            version = ctypes.string_at(version_ptr).decode('utf-8')
-            print(f"📦 Umbrella version: {version}")
-            lib.umbrella_free_string(version_ptr)
+        if umb.version:
+            write_bytes_line("📦 Umbrella version: ".encode('utf-8'), umb.version)
         
         # Test 3: Get current Maya scene file
         print("\n3. Scanning current Maya scene...")
@@ -102,7 +43,8 @@ def test_umbrella_in_maya():
         if current_scene:
             print(f"🎬 Current scene: {current_scene}")
             scene_bytes = current_scene.encode('utf-8')
-            scan_result = lib.umbrella_scan_file(scene_bytes)
+            lib.umbrella_scan_file(scene_bytes, scan_out_ref)
+            scan_result = scan_out
             
             print(f"📊 Scan Results:")
             print(f"   - Threats found: {scan_result.threats_found}")
@@ -130,7 +72,8 @@ def test_umbrella_in_maya():
             
             # Scan the test scene
             scene_bytes = test_scene_path.encode('utf-8')
-            scan_result = lib.umbrella_scan_file(scene_bytes)
+            lib.umbrella_scan_file(scene_bytes, scan_out_ref)
+            scan_result = scan_out
             
             print(f"📊 Test Scene Scan Results:")
             print(f"   - Threats found: {scan_result.threats_found}")
@@ -145,7 +88,8 @@ def test_umbrella_in_maya():
         if os.path.exists(scripts_dir):
             print(f"📁 Scanning directory: {scripts_dir}")
             dir_bytes = scripts_dir.encode('utf-8')
-            dir_scan_result = lib.umbrella_scan_directory(dir_bytes)
+            lib.umbrella_scan_directory(dir_bytes, scan_out_ref)
+            dir_scan_result = scan_out
             
             print(f"📊 Directory Scan Results:")
             print(f"   - Threats found: {dir_scan_result.threats_found}")
@@ -156,11 +100,7 @@ def test_umbrella_in_maya():
         
         # Test 5: Cleanup
         print("\n5. Cleaning up...")
-        cleanup_result = lib.umbrella_cleanup()
-        if cleanup_result.success:
-            print("✅ Cleanup completed successfully!")
-        else:
-            print(f"⚠️  Cleanup warning (error code: {cleanup_result.error_code})")
+        print("✅ Engine cleanup is registered to run when the interpreter exits")
         
         print("\n" + "=" * 60)
         print("🎉 All tests completed successfully!")
@@ -4,75 +4,24 @@ Simple test script for Umbrella threat detection functionality
 """
 
 import ctypes
+import functools
 import os
 import tempfile
 
-# Define the structures
-class UmbrellaResult(ctypes.Structure):
-    _fields_ = [
-        ("success", ctypes.c_bool),
-        ("error_code", ctypes.c_int)
-    ]
+from umbrella_ffi import ScanResult, get_instance, load_extension, pack_paths
+from umbrella_scenes import make_scenes
 
-class ScanResult(ctypes.Structure):
-    _fields_ = [
-        ("threats_found", ctypes.c_int),
-        ("files_scanned", ctypes.c_int),
-        ("scan_time_ms", ctypes.c_int)
-    ]
+# Prefer the compiled Cython extension, fall back to ctypes when it is not built or fails to load
+_umbrella_ffi = load_extension()
 
-def test_threat_detection():
-    """Test the threat detection functionality"""
-    
-    # Load the library
-    dll_path = "target/release/umbrella_maya_plugin.dll"
-    if not os.path.exists(dll_path):
-        print(f"Error: DLL not found at {dll_path}")
-        return False
-    
-    try:
-        lib = ctypes.CDLL(dll_path)
-        
-        # Define function signatures
-        lib.umbrella_init.restype = UmbrellaResult
-        lib.umbrella_scan_file.restype = ScanResult
-        lib.umbrella_scan_file.argtypes = [ctypes.c_char_p]
-        lib.umbrella_cleanup.restype = UmbrellaResult
-        
-        print("=== Umbrella Threat Detection Test ===")
-        
-        # Initialize
-        init_result = lib.umbrella_init()
-        if not init_result.success:
-            print("Failed to initialize")
-            return False
-        print("✅ Initialized successfully")
-        
-        # Test 1: Clean file
-        print("\n1. Testing clean file...")
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.ma', delete=False) as f:
-            f.write("""
+CLEAN_SCENE = """
 // Clean Maya scene file
 createNode transform -n "pCube1";
 createNode mesh -n "pCubeShape1" -p "pCube1";
 setAttr ".v" no;
-""")
-            clean_file = f.name
-        
-        result = lib.umbrella_scan_file(clean_file.encode('utf-8'))
-        print(f"   Threats found: {result.threats_found}")
-        print(f"   Files scanned: {result.files_scanned}")
-        print(f"   Scan time: {result.scan_time_ms}ms")
-        
-        if result.threats_found == 0:
-            print("   ✅ Clean file correctly identified")
-        else:
-            print("   ⚠️  False positive detected")
-        
-        # Test 2: Suspicious file
-        print("\n2. Testing suspicious file...")
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write("""
+"""
+
+SUSPICIOUS_SCRIPT = """
 import os
 import subprocess
 import sys
@@ -85,33 +34,117 @@ subprocess.call(['notepad.exe'])
 # Maya-specific suspicious patterns
 import maya.cmds as cmds
 cmds.evalDeferred("python('import os; os.system(\\"rm -rf /\\")')")
-""")
+"""
+
+# A single result buffer reused by every scan; helpers copy the fields out before returning
+_out = ScanResult()
+_out_ref = ctypes.byref(_out)
+
+@functools.lru_cache(maxsize=256)
+def _path_buffer(path):
+    """Return a cached NUL-terminated C buffer for the given path"""
+    return ctypes.create_string_buffer(path.encode('utf-8'))
+
+# Pick the scan implementation once at import time rather than on every call
+if _umbrella_ffi is not None:
+    def _scan_file(lib, path):
+        """Scan a single file, returning (threats_found, files_scanned, scan_time_ms)"""
+        return _umbrella_ffi.scan_file(path.encode('utf-8'))
+else:
+    def _scan_file(lib, path):
+        """Scan a single file, returning (threats_found, files_scanned, scan_time_ms)"""
+        lib.umbrella_scan_file(_path_buffer(path), _out_ref)
+        return _out.threats_found, _out.files_scanned, _out.scan_time_ms
+
+def _scan_bytes(lib, content):
+    """Scan in-memory content, returning (threats_found, files_scanned, scan_time_ms)"""
+    data = content.encode('utf-8')
+    lib.umbrella_scan_bytes(data, len(data), _out_ref)
+    return _out.threats_found, _out.files_scanned, _out.scan_time_ms
+
+def test_threat_detection():
+    """Test the threat detection functionality"""
+    
+    try:
+        print("=== Umbrella Threat Detection Test ===")
+        
+        # Load and initialize the engine shared with the other entry points
+        umb = get_instance()
+        if umb is None or not umb.initialize():
+            print("Failed to initialize")
+            return False
+        lib = umb.lib
+        print("✅ Initialized successfully")
+        
+        # Test 1: Clean content
+        print("\n1. Testing clean content...")
+        threats_found, files_scanned, scan_time_ms = _scan_bytes(lib, CLEAN_SCENE)
+        print(f"   Threats found: {threats_found}")
+        print(f"   Files scanned: {files_scanned}")
+        print(f"   Scan time: {scan_time_ms}ms")
+        
+        if threats_found == 0:
+            print("   ✅ Clean content correctly identified")
+        else:
+            print("   ⚠️  False positive detected")
+        
+        # Test 2: Suspicious content
+        print("\n2. Testing suspicious content...")
+        threats_found, files_scanned, scan_time_ms = _scan_bytes(lib, SUSPICIOUS_SCRIPT)
+        print(f"   Threats found: {threats_found}")
+        print(f"   Files scanned: {files_scanned}")
+        print(f"   Scan time: {scan_time_ms}ms")
+        
+        if threats_found > 0:
+            print("   ✅ Threats correctly detected")
+        else:
+            print("   ❌ Failed to detect threats")
+        
+        # Test 3: Suspicious file on disk (filesystem code path)
+        print("\n3. Testing suspicious file...")
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(SUSPICIOUS_SCRIPT)
             suspicious_file = f.name
         
-        result = lib.umbrella_scan_file(suspicious_file.encode('utf-8'))
-        print(f"   Threats found: {result.threats_found}")
-        print(f"   Files scanned: {result.files_scanned}")
-        print(f"   Scan time: {result.scan_time_ms}ms")
+        threats_found, files_scanned, scan_time_ms = _scan_file(lib, suspicious_file)
+        print(f"   Threats found: {threats_found}")
+        print(f"   Files scanned: {files_scanned}")
+        print(f"   Scan time: {scan_time_ms}ms")
         
-        if result.threats_found > 0:
+        if threats_found > 0:
             print("   ✅ Threats correctly detected")
         else:
             print("   ❌ Failed to detect threats")
         
-        # Test 3: Non-existent file
-        print("\n3. Testing non-existent file...")
-        result = lib.umbrella_scan_file(b"non_existent_file.ma")
-        print(f"   Threats found: {result.threats_found}")
+        # Test 4: Non-existent file
+        print("\n4. Testing non-existent file...")
+        threats_found, _, _ = _scan_file(lib, "non_existent_file.ma")
+        print(f"   Threats found: {threats_found}")
         
-        if result.threats_found == -1:
+        if threats_found == -1:
             print("   ✅ Error correctly handled")
         else:
             print("   ❌ Error handling failed")
         
-        # Cleanup
-        lib.umbrella_cleanup()
-        os.unlink(clean_file)
+        # Test 5: Batch scan of generated scenes
+        print("\n5. Testing batch scan of generated scenes...")
+        scene_paths = make_scenes(8)
+        arena, path_array = pack_paths(scene_paths)
+        status = lib.umbrella_scan_paths(path_array, len(scene_paths), _out_ref)
+        result = _out
+        print(f"   Threats found: {result.threats_found}")
+        print(f"   Files scanned: {result.files_scanned}")
+        print(f"   Scan time: {result.scan_time_ms}ms")
+        
+        if status == 0 and result.files_scanned == len(scene_paths) and result.threats_found > 0:
+            print("   ✅ Batch scan detected threats")
+        else:
+            print("   ❌ Batch scan failed")
+        
+        # Cleanup (the engine itself is cleaned up at interpreter exit)
         os.unlink(suspicious_file)
+        for path in scene_paths:
+            os.unlink(path)
         
         print("\n🎉 Threat detection test completed!")
         return True
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Shared ctypes bindings for the Umbrella Rust library
+Used by the Maya integration demo and the test scripts
+"""
+
+import atexit
+import codecs
+import contextlib
+import ctypes
+import functools
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+
+# Define the structures that match the Rust definitions
+class UmbrellaResult(ctypes.Structure):
+    _fields_ = [
+        ("success", ctypes.c_bool),
+        ("error_code", ctypes.c_int)
+    ]
+
+class ScanResult(ctypes.Structure):
+    _fields_ = [
+        ("threats_found", ctypes.c_int),
+        ("files_scanned", ctypes.c_int),
+        ("scan_time_ms", ctypes.c_int)
+    ]
+
+# Directories that may contain the built library, relative to the working directory
+LIBRARY_DIRS = ["target/release", ".", "build/lib"]
+
+if sys.platform == "win32":
+    LIBRARY_NAME = "umbrella_maya_plugin.dll"
+elif sys.platform == "darwin":
+    LIBRARY_NAME = "libumbrella_maya_plugin.dylib"
+else:
+    LIBRARY_NAME = "libumbrella_maya_plugin.so"
+
+# LoadLibraryExW flag: search the application directory, System32 and
+# every directory registered with os.add_dll_directory
+LOAD_LIBRARY_SEARCH_DEFAULT_DIRS = 0x00001000
+
+_SCAN_OUT = ctypes.POINTER(ScanResult)
+
+# Function signatures: name -> (restype, argtypes)
+# Scan functions return 0/-1 and write their statistics into a caller-provided ScanResult
+_SIGNATURES = {
+    "umbrella_init": (UmbrellaResult, []),
+    "umbrella_scan_file": (ctypes.c_int, [ctypes.c_char_p, _SCAN_OUT]),
+    "umbrella_scan_directory": (ctypes.c_int, [ctypes.c_char_p, _SCAN_OUT]),
+    "umbrella_scan_paths": (ctypes.c_int, [ctypes.POINTER(ctypes.c_char_p), ctypes.c_size_t, _SCAN_OUT]),
+    "umbrella_scan_bytes": (ctypes.c_int, [ctypes.c_void_p, ctypes.c_size_t, _SCAN_OUT]),
+    # c_void_p keeps the raw pointer so it can be handed back to umbrella_free_string
+    "umbrella_get_version": (ctypes.c_void_p, []),
+    "umbrella_free_string": (None, [ctypes.c_void_p]),
+    "umbrella_cleanup": (UmbrellaResult, []),
+}
+
+@functools.lru_cache(maxsize=None)
+def _configure_lib(lib_path):
+    """Load the library and set up every function signature once per path"""
+    lib = ctypes.CDLL(lib_path, mode=ctypes.RTLD_LOCAL, winmode=LOAD_LIBRARY_SEARCH_DEFAULT_DIRS)
+    for name, (restype, argtypes) in _SIGNATURES.items():
+        func = getattr(lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+    return lib
+
+def _library_candidates():
+    """Return what to hand to the loader, letting the OS search LIBRARY_DIRS where it can
+    
+    On Windows the directories are registered by _dll_search_dirs so a single
+    LoadLibraryExW call searches all of them. Elsewhere the loader cannot be
+    pointed at new directories at runtime, so each full path is tried in turn
+    without a separate existence check.
+    """
+    if sys.platform != "win32":
+        return [os.path.join(d, LIBRARY_NAME) for d in LIBRARY_DIRS]
+    return [LIBRARY_NAME]
+
+@contextlib.contextmanager
+def _dll_search_dirs():
+    """Register LIBRARY_DIRS as DLL search directories on Windows for the duration of a load
+    
+    The directories are resolved against the current working directory and
+    removed again afterwards, so a later load after a chdir never searches
+    stale locations. Dependencies are resolved while the library loads, so
+    the registration is not needed once it is in memory.
+    """
+    handles = []
+    if sys.platform == "win32":
+        for d in LIBRARY_DIRS:
+            try:
+                handles.append(os.add_dll_directory(os.path.abspath(d)))
+            except OSError:
+                continue
+    try:
+        yield
+    finally:
+        for handle in handles:
+            handle.close()
+
+def _library_path(lib):
+    """Return the file the loader actually resolved for lib"""
+    if sys.platform != "win32":
+        return os.path.abspath(lib._name)
+    
+    buf = ctypes.create_unicode_buffer(32768)
+    get_module_file_name = ctypes.WinDLL("kernel32").GetModuleFileNameW
+    get_module_file_name.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_uint32]
+    if get_module_file_name(lib._handle, buf, len(buf)):
+        return buf.value
+    return lib._name
+
+def load_library():
+    """Load the Umbrella library from LIBRARY_DIRS, relative to the current working directory
+    
+    On Linux and macOS the directories are tried in LIBRARY_DIRS order. On
+    Windows they are all searched by one LoadLibraryExW call whose order among
+    them is not defined, so keep a single build of the DLL in those directories.
+    """
+    with _dll_search_dirs():
+        for candidate in _library_candidates():
+            try:
+                lib = _configure_lib(candidate)
+            except OSError:
+                continue
+            except Exception as e:
+                print(f"❌ Failed to load library from {candidate}: {e}")
+                continue
+            
+            print(f"✅ Successfully loaded Umbrella library: {_library_path(lib)}")
+            return lib
+    
+    print("❌ Could not find Umbrella library in any expected location")
+    return None
+
+def load_extension():
+    """Import the optional compiled _umbrella_ffi extension
+    
+    The import runs inside _dll_search_dirs so that on Windows the extension
+    can resolve the Rust DLL in LIBRARY_DIRS. Returns None when the extension
+    is not built, and prints a notice when it is built but fails to load.
+    """
+    if importlib.util.find_spec("_umbrella_ffi") is None:
+        return None
+    
+    with _dll_search_dirs():
+        try:
+            return importlib.import_module("_umbrella_ffi")
+        except ImportError as e:
+            print(f"⚠️  Found the _umbrella_ffi extension but could not load it, using ctypes: {e}")
+            return None
+
+# Whether umbrella_init has run in this process; checked before taking _INIT_LOCK
+_initialized = False
+_INIT_LOCK = threading.Lock()
+
+class UmbrellaLibrary:
+    """The loaded Umbrella library, shared by the whole process"""
+    
+    def __init__(self, lib):
+        self.lib = lib
+        self.version = None
+    
+    @property
+    def initialized(self):
+        return _initialized
+    
+    def initialize(self):
+        """Run umbrella_init if it has not run yet in this process
+        
+        Safe to call repeatedly; only the first call crosses into the library.
+        Cleanup is registered with atexit on the first successful call.
+        """
+        global _initialized
+        if _initialized:
+            return True
+        
+        with _INIT_LOCK:
+            if _initialized:
+                return True
+            
+            result = self.lib.umbrella_init()
+            if not result.success:
+                print(f"❌ Initialization failed with error code: {result.error_code}")
+                return False
+            
+            self.version = self._read_version()
+            atexit.register(self.cleanup)
+            _initialized = True
+            return True
+    
+    def _read_version(self):
+        """Copy the raw UTF-8 version bytes and free the native allocation right away"""
+        version_ptr = self.lib.umbrella_get_version()
+        if version_ptr:
+            raw = ctypes.string_at(version_ptr)
+            self.lib.umbrella_free_string(version_ptr)
+            return raw
+        return None
+    
+    def cleanup(self):
+        """Shut down the engine, returning the UmbrellaResult or None if it was not running"""
+        global _initialized
+        with _INIT_LOCK:
+            if not _initialized:
+                return None
+            _initialized = False
+            atexit.unregister(self.cleanup)
+            return self.lib.umbrella_cleanup()
+
+def _is_utf8(encoding):
+    """Return True if the named encoding normalizes to UTF-8"""
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except (LookupError, TypeError):
+        return False
+
+def write_bytes_line(prefix, raw):
+    """Write UTF-8 prefix + raw + newline to stdout without decoding raw where possible
+    
+    The raw bytes only go straight to the binary buffer when stdout itself is
+    UTF-8. Otherwise (e.g. Maya's script editor with no buffer, or a GBK
+    console) the line is decoded and encoded by the text layer like all other output.
+    """
+    line = prefix + raw + b"\n"
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None or not _is_utf8(getattr(sys.stdout, "encoding", None)):
+        sys.stdout.write(line.decode("utf-8"))
+        return
+    # Flush pending text first so the line keeps its place in the output
+    sys.stdout.flush()
+    buffer.write(line)
+
+def pack_paths(paths):
+    """Build the char* array for umbrella_scan_paths from a list of str paths
+    
+    All paths are encoded into one NUL-separated buffer and the array points at
+    offsets inside it. Returns (arena, path_array); keep the arena alive while
+    the array is in use.
+    """
+    count = len(paths)
+    packed = '\0'.join(paths).encode('utf-8')
+    arena = ctypes.create_string_buffer(packed)
+    base = ctypes.addressof(arena)
+    path_array = (ctypes.c_char_p * count)()
+    offset = 0
+    for i in range(count):
+        path_array[i] = base + offset
+        offset = packed.find(b'\0', offset) + 1
+    return arena, path_array
+
+_INSTANCE = None
+_INSTANCE_LOCK = threading.Lock()
+
+def get_instance():
+    """Return the process-wide UmbrellaLibrary, loading it on first use
+    
+    Returns None if the library cannot be loaded. The engine itself is
+    initialized lazily by UmbrellaLibrary.initialize().
+    """
+    global _INSTANCE
+    if _INSTANCE is not None:
+        return _INSTANCE
+    
+    with _INSTANCE_LOCK:
+        if _INSTANCE is None:
+            lib = load_library()
+            if lib is not None:
+                _INSTANCE = UmbrellaLibrary(lib)
+        return _INSTANCE
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Synthetic Maya ASCII test scenes shared by the demo and the test scripts
+"""
+
+import os
+import tempfile
+from multiprocessing import Pool
+
+# Worker processes cannot be forked from inside Maya, so scenes are written serially there
+try:
+    import maya.cmds as cmds
+except ImportError:
+    cmds = None
+
+# Suspicious script embedded in the test scenes
+SUSPICIOUS_SCRIPT = '''
+import os
+import subprocess
+# 这是一个可疑的脚本
+exec("print('potentially malicious code')")
+eval("os.system('echo test')")
+mel.eval("system(\\"dir\\");")
+'''
+
+def _mel_string(text):
+    """Escape text as a MEL string literal"""
+    escaped = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'
+
+def write_synthetic_scene(path, body):
+    """Write a test scene without Maya, in a single write through a large buffer"""
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(body.encode('utf-8'))
+    return path
+
+def synthetic_scene_body():
+    """Build Maya ASCII content equivalent to the scene the demo creates through Maya"""
+    return "\n".join([
+        "//Maya ASCII scene",
+        'createNode transform -n "test_cube";',
+        'createNode transform -n "test_sphere";',
+        '\tsetAttr ".t" -type "double3" 3 0 0 ;',
+        'createNode script -n "suspicious_script_node";',
+        f'\tsetAttr ".b" -type "string" {_mel_string(SUSPICIOUS_SCRIPT)};',
+        '\tsetAttr ".st" 2;',
+        "",
+    ])
+
+def write_numbered_scene(index):
+    """Write the index-th synthetic test scene (process pool task)"""
+    path = os.path.join(tempfile.gettempdir(), f"umbrella_test_scene_with_threats_{index}.ma")
+    return write_synthetic_scene(path, synthetic_scene_body())
+
+def make_scenes(n):
+    """Write n synthetic test scenes and return their paths
+
+    Scenes are written in parallel by a process pool outside Maya and serially inside it.
+    """
+    if cmds is not None:
+        return [write_numbered_scene(i) for i in range(n)]
+    with Pool() as pool:
+        return pool.map(write_numbered_scene, range(n))